@@ -8,11 +8,14 @@ from .terminal_manager import ImprovedTerminalManager as TerminalManager
 from .command_manager import CommandManager
 from .terminal_handlers import (
     handle_execute_command,
+    handle_execute_command_kw,
     handle_read_output,
+    handle_read_output_kw,
     handle_force_terminate,
+    handle_force_terminate_kw,
     handle_list_sessions
 )
-from .process_tools import handle_list_processes, handle_kill_process
+from .process_tools import handle_list_processes, handle_kill_process, handle_kill_process_kw
 from .terminal_types import (
     TerminalSession,
     CommandExecutionResult,
@@ -20,6 +23,7 @@ from .terminal_types import (
     CompletedSession,
     ProcessInfo,
     CommandValidationResult,
+    HandlerResult,
     TerminalError
 )
 
@@ -27,16 +31,21 @@ __all__ = [
     "TerminalManager",
     "CommandManager",
     "handle_execute_command",
+    "handle_execute_command_kw",
     "handle_read_output", 
+    "handle_read_output_kw",
     "handle_force_terminate",
+    "handle_force_terminate_kw",
     "handle_list_sessions",
     "handle_list_processes",
     "handle_kill_process",
+    "handle_kill_process_kw",
     "TerminalSession",
     "CommandExecutionResult",
     "ActiveSessionInfo",
     "CompletedSession",
     "ProcessInfo",
     "CommandValidationResult",
+    "HandlerResult",
     "TerminalError"
 ]
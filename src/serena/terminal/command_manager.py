@@ -3,93 +3,134 @@ Command validation and management system.
 Based on Desktop Commander MCP Server command management.
 """
 
-from typing import List, Set, Optional
+from functools import lru_cache
+from typing import FrozenSet, Iterator, List, Set, Optional, Pattern
 import re
 import shlex
 from .terminal_types import CommandValidationResult
 
+# Dangerous command patterns (matched against the lowercased command),
+# combined into a single alternation compiled once per process
+_DANGEROUS_PATTERNS = re.compile(
+    r"rm\s+-rf\s+/"  # rm -rf /
+    r"|del\s+/s\s+c:"  # del /s c:
+    r"|format\s+c:"  # format c:
+    r"|dd\s+if=.*of=/dev"  # dd if=... of=/dev...
+    r"|>\s*/dev/"  # redirect to /dev/
+    r"|sudo\s+rm"  # sudo rm
+)
+# Substrings of which every match of _DANGEROUS_PATTERNS contains at least one
+# ("format c:" and "sudo rm" both contain "rm"); commands without any are safe without running the regex
+_DANGER_HINTS = ("rm", "del", "dd", ">")
+
+# Common command separators (;, &&, ||, |, &), matched in a single pass
+_CMD_SEPARATOR_RE = re.compile(r"&&|\|\||[;|&]")
+
+# First token of a command
+_FIRST_TOKEN_RE = re.compile(r"\s*([^\s;|&]+)")
+
+# Characters which shell tokenization removes from a command name
+_QUOTE_OR_ESCAPE_RE = re.compile(r"[\"'\\]")
+
+# Default blocked dangerous commands
+_DEFAULT_BLOCKED_COMMANDS: FrozenSet[str] = frozenset({
+    # Disk and partition management
+    "mkfs", "format", "mount", "umount", "fdisk", "dd", "parted", 
+    "diskpart", "fsck", "e2fsck", "gparted",
+
+    # System administration and user management
+    "sudo", "su", "passwd", "adduser", "useradd", "usermod", 
+    "groupadd", "chsh", "visudo", "deluser", "userdel",
+
+    # System control
+    "shutdown", "reboot", "halt", "poweroff", "init", "systemctl",
+    "service", "chkconfig",
+
+    # Dangerous file operations
+    "chmod 777", "chown", "rm -rf", "del /s", "deltree", 
+    "format c:", "rd /s",
+
+    # Network and security
+    "iptables", "firewall", "netsh", "ufw", "fail2ban",
+
+    # Windows system commands
+    "sfc", "bcdedit", "reg delete", "net user", "sc delete", 
+    "runas", "cipher", "takeown", "icacls"
+})
+
+
+@lru_cache(maxsize=16)
+def _compile_blocked_pattern(blocked_commands: FrozenSet[str]) -> Optional[Pattern[str]]:
+    """
+    Compile all blocked commands into a single alternation, which finds any occurrence of a blocked
+    command in a lowercased command string in one scan. A command string without a match cannot contain a
+    blocked command, so it does not need to be tokenized.
+    Cached, so that managers using the same blocked commands (e.g. the defaults) share one pattern.
+    """
+    if not blocked_commands:
+        return None
+    words = sorted(blocked_commands, key=len, reverse=True)
+    return re.compile("|".join(re.escape(word.lower()) for word in words))
+
 
 class CommandManager:
     """Manages command validation and security"""
     
     def __init__(self, blocked_commands: Optional[List[str]] = None):
         """Initialize with blocked commands list"""
-        self.blocked_commands: Set[str] = set(blocked_commands or self._get_default_blocked_commands())
-    
-    def _get_default_blocked_commands(self) -> List[str]:
-        """Get default list of blocked dangerous commands"""
-        return [
-            # Disk and partition management
-            "mkfs", "format", "mount", "umount", "fdisk", "dd", "parted", 
-            "diskpart", "fsck", "e2fsck", "gparted",
-            
-            # System administration and user management
-            "sudo", "su", "passwd", "adduser", "useradd", "usermod", 
-            "groupadd", "chsh", "visudo", "deluser", "userdel",
-            
-            # System control
-            "shutdown", "reboot", "halt", "poweroff", "init", "systemctl",
-            "service", "chkconfig",
-            
-            # Dangerous file operations
-            "chmod 777", "chown", "rm -rf", "del /s", "deltree", 
-            "format c:", "rd /s",
-            
-            # Network and security
-            "iptables", "firewall", "netsh", "ufw", "fail2ban",
-            
-            # Windows system commands
-            "sfc", "bcdedit", "reg delete", "net user", "sc delete", 
-            "runas", "cipher", "takeown", "icacls"
-        ]
+        self.blocked_commands: Set[str] = set(blocked_commands or _DEFAULT_BLOCKED_COMMANDS)
+        self._blocked_pattern = _compile_blocked_pattern(frozenset(self.blocked_commands))
     
     def get_base_command(self, command: str) -> str:
         """Extract base command from command string"""
+        return self._get_first_token(command).lower()
+    
+    @staticmethod
+    def _get_first_token(command: str) -> str:
+        """Extract the first token of a command string, keeping its case"""
+        # Fast path: the first token up to whitespace (or a command separator)
+        match = _FIRST_TOKEN_RE.match(command)
+        if match is None:
+            return ""
+        token = match.group(1)
+        if not _QUOTE_OR_ESCAPE_RE.search(token):
+            return token
+        
+        # Quotes or escapes in the first token (e.g. s'u'do) require full shell tokenization
         try:
             # Remove leading/trailing whitespace
             command = command.strip()
             
-            # Handle empty command
-            if not command:
-                return ""
-            
             # Split command and get first token
             tokens = shlex.split(command)
             if not tokens:
                 return ""
                 
-            return tokens[0].lower()
+            return tokens[0]
         except (ValueError, Exception):
             # If shlex fails, fall back to simple split
-            return command.split()[0].lower() if command.split() else ""
+            return command.split()[0] if command.split() else ""
     
-    def extract_commands(self, command_string: str) -> List[str]:
-        """Extract all commands from a complex command string"""
+    def _iter_commands(self, command_string: str) -> Iterator[str]:
+        """Lazily yield the first token (keeping its case) of each command in a complex command string"""
+        # Split by common command separators
+        start = 0
+        for separator in _CMD_SEPARATOR_RE.finditer(command_string):
+            cmd = self._get_first_token(command_string[start:separator.start()])
+            if cmd:
+                yield cmd
+            start = separator.end()
+        cmd = self._get_first_token(command_string[start:])
+        if cmd:
+            yield cmd
+    
+    def extract_commands(self, command_string: str) -> Set[str]:
+        """Extract all (distinct) commands from a complex command string"""
         try:
-            commands = []
-            
-            # Split by common command separators
-            separators = [';', '&&', '||', '|', '&']
-            
-            # Simple splitting approach for now
-            parts = [command_string]
-            for separator in separators:
-                new_parts = []
-                for part in parts:
-                    new_parts.extend(part.split(separator))
-                parts = new_parts
-            
-            # Extract base command from each part
-            for part in parts:
-                base_cmd = self.get_base_command(part.strip())
-                if base_cmd:
-                    commands.append(base_cmd)
-            
-            return list(set(commands))  # Remove duplicates
-            
+            return {cmd.lower() for cmd in self._iter_commands(command_string)}
         except Exception:
             # If extraction fails, return just the base command
-            return [self.get_base_command(command_string)]
+            return {self.get_base_command(command_string)}
     
     def validate_command(self, command: str) -> CommandValidationResult:
         """Validate if command is allowed to execute"""
@@ -97,17 +138,22 @@ class CommandManager:
             if not command or not command.strip():
                 return CommandValidationResult(False, "Empty command not allowed")
             
-            # Extract all commands from the command string
-            commands = self.extract_commands(command)
+            # All checks are case-insensitive, so lowercase the command once up front
+            command_lc = command.lower()
             
-            # Check each extracted command
-            for cmd in commands:
-                if cmd in self.blocked_commands:
-                    return CommandValidationResult(False, f"Blocked command: {cmd}")
-                
-                # Check for dangerous patterns
-                if self._check_dangerous_patterns(command):
-                    return CommandValidationResult(False, "Dangerous command pattern detected")
+            # Check each command in the command string, stopping at the first blocked one.
+            # Commands are only extracted if a blocked command occurs anywhere in the string,
+            # or if quotes/escapes could hide one from the scan (e.g. s'u'do).
+            if self._blocked_pattern is not None and (
+                self._blocked_pattern.search(command_lc) or _QUOTE_OR_ESCAPE_RE.search(command_lc)
+            ):
+                for cmd in self._iter_commands(command_lc):
+                    if cmd in self.blocked_commands:
+                        return CommandValidationResult(False, f"Blocked command: {cmd}")
+            
+            # Check for dangerous patterns
+            if self._check_dangerous_patterns(command_lc):
+                return CommandValidationResult(False, "Dangerous command pattern detected")
             
             return CommandValidationResult(True)
             
@@ -115,31 +161,21 @@ class CommandManager:
             # If validation fails, err on the side of caution
             return CommandValidationResult(False, f"Validation error: {str(e)}")
     
-    def _check_dangerous_patterns(self, command: str) -> bool:
-        """Check for dangerous command patterns"""
-        dangerous_patterns = [
-            r'rm\s+-rf\s+/',     # rm -rf /
-            r'del\s+/s\s+c:',    # del /s c:
-            r'format\s+c:',      # format c:
-            r'dd\s+if=.*of=/dev', # dd if=... of=/dev...
-            r'>\s*/dev/',        # redirect to /dev/
-            r'sudo\s+rm',        # sudo rm
-        ]
-        
-        cmd_lower = command.lower()
-        for pattern in dangerous_patterns:
-            if re.search(pattern, cmd_lower):
-                return True
-        
-        return False
+    def _check_dangerous_patterns(self, command_lc: str) -> bool:
+        """Check the lowercased command for dangerous command patterns"""
+        if not any(hint in command_lc for hint in _DANGER_HINTS):
+            return False
+        return _DANGEROUS_PATTERNS.search(command_lc) is not None
     
     def add_blocked_command(self, command: str) -> None:
         """Add a command to the blocked list"""
         self.blocked_commands.add(command.lower())
+        self._blocked_pattern = _compile_blocked_pattern(frozenset(self.blocked_commands))
     
     def remove_blocked_command(self, command: str) -> None:
         """Remove a command from the blocked list"""
         self.blocked_commands.discard(command.lower())
+        self._blocked_pattern = _compile_blocked_pattern(frozenset(self.blocked_commands))
     
     def get_blocked_commands(self) -> List[str]:
         """Get list of blocked commands"""
@@ -3,74 +3,98 @@ Process management tools.
 Based on Desktop Commander MCP Server process management.
 """
 
+import asyncio
+import locale
 import os
 import signal
 import subprocess
 import sys
-from typing import List, Dict, Any
-from .terminal_types import ProcessInfo
+import threading
+import time
+from typing import List, Dict, Any, Optional
+import psutil
+from .terminal_types import HandlerResult, ProcessInfo
+from ..util.async_utils import run_blocking
 
 
-async def handle_list_processes() -> Dict[str, Any]:
+# Maximum number of processes included in a listing
+_MAX_LISTED_PROCESSES = 50
+
+# Formatted process listing, reused for repeated calls within a short time
+_PROCESS_LIST_CACHE_TTL_SECONDS = 1.0
+_process_list_cache: Dict[str, Any] = {"timestamp": 0.0, "text": None}
+_process_list_cache_lock = threading.Lock()
+
+
+def _invalidate_process_list_cache() -> None:
+    with _process_list_cache_lock:
+        _process_list_cache["text"] = None
+
+
+async def _run_command(args: List[str], timeout_seconds: float) -> subprocess.CompletedProcess:
+    """
+    Run a command to completion without blocking the event loop, capturing its (decoded) output.
+    Raises subprocess.TimeoutExpired (after killing the process) if it does not complete in time.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout_seconds)
+    except TimeoutError:
+        process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(args, timeout_seconds) from None
+    # Set once communicate() has returned
+    assert process.returncode is not None
+    encoding = locale.getpreferredencoding(False)
+    return subprocess.CompletedProcess(
+        args, process.returncode, stdout.decode(encoding, errors="replace"), stderr.decode(encoding, errors="replace")
+    )
+
+
+def _list_processes_psutil() -> List[ProcessInfo]:
+    """List processes via psutil, without spawning a subprocess"""
+    processes = []
+    now = time.time()
+    # Read once instead of per process (as memory_percent would)
+    total_memory = psutil.virtual_memory().total
+    # With attrs, process_iter reads all attributes of a process within a single oneshot() context
+    for proc in psutil.process_iter(["pid", "name", "cpu_times", "create_time", "memory_info"]):
+        info = proc.info
+        # Average CPU usage over the lifetime of the process (as reported by ps)
+        cpu = "N/A"
+        cpu_times, create_time = info["cpu_times"], info["create_time"]
+        if cpu_times is not None and create_time:
+            elapsed = max(now - create_time, 1e-6)
+            cpu = f"{100.0 * (cpu_times.user + cpu_times.system) / elapsed:.1f}"
+        memory_info = info["memory_info"]
+        processes.append(ProcessInfo(
+            pid=info["pid"],
+            command=info["name"] or "",
+            cpu=cpu,
+            memory=f"{100.0 * memory_info.rss / total_memory:.1f}" if memory_info is not None and total_memory else "N/A"
+        ))
+        if len(processes) >= _MAX_LISTED_PROCESSES:
+            break
+    return processes
+
+
+async def handle_list_processes() -> HandlerResult:
     """List all running processes on the system"""
     try:
-        processes = []
+        with _process_list_cache_lock:
+            cached_text = _process_list_cache["text"]
+            if cached_text is not None and time.monotonic() - _process_list_cache["timestamp"] < _PROCESS_LIST_CACHE_TTL_SECONDS:
+                return HandlerResult(cached_text)
         
-        if sys.platform == "win32":
-            # Windows: use tasklist
-            result = subprocess.run(
-                ["tasklist", "/fo", "csv"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')[1:]  # Skip header
-                for line in lines[:50]:  # Limit to 50 processes
-                    try:
-                        parts = line.strip().split('","')
-                        if len(parts) >= 5:
-                            name = parts[0].strip('"')
-                            pid = parts[1].strip('"')
-                            memory = parts[4].strip('"')
-                            
-                            processes.append(ProcessInfo(
-                                pid=int(pid),
-                                command=name,
-                                cpu="N/A",  # Windows tasklist doesn't provide CPU%
-                                memory=memory
-                            ))
-                    except (ValueError, IndexError):
-                        continue
-        else:
-            # Unix/Linux: use ps
-            result = subprocess.run(
-                ["ps", "aux"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')[1:]  # Skip header
-                for line in lines[:50]:  # Limit to 50 processes
-                    try:
-                        parts = line.split()
-                        if len(parts) >= 11:
-                            processes.append(ProcessInfo(
-                                pid=int(parts[1]),
-                                command=parts[10],
-                                cpu=parts[2],
-                                memory=parts[3]
-                            ))
-                    except (ValueError, IndexError):
-                        continue
+        # Walking all processes takes a while, so do it outside the event loop
+        processes = await run_blocking(_list_processes_psutil)
         
         if not processes:
-            return {
-                "content": [{"type": "text", "text": "No processes found or unable to list processes"}]
-            }
+            return HandlerResult("No processes found or unable to list processes")
         
         # Format output
         process_list = []
@@ -78,92 +102,59 @@ async def handle_list_processes() -> Dict[str, Any]:
             process_list.append(
                 f"PID: {p.pid}, Command: {p.command}, CPU: {p.cpu}, Memory: {p.memory}"
             )
+        text = "\n".join(process_list)
         
-        return {
-            "content": [{"type": "text", "text": "\n".join(process_list)}]
-        }
+        with _process_list_cache_lock:
+            _process_list_cache["timestamp"] = time.monotonic()
+            _process_list_cache["text"] = text
+        
+        return HandlerResult(text)
         
-    except subprocess.TimeoutExpired:
-        return {
-            "content": [{"type": "text", "text": "Error: Process listing timed out"}],
-            "isError": True
-        }
     except Exception as e:
-        return {
-            "content": [{"type": "text", "text": f"Error listing processes: {str(e)}"}],
-            "isError": True
-        }
+        return HandlerResult(f"Error listing processes: {str(e)}", is_error=True)
 
 
-async def handle_kill_process(args: Dict[str, Any]) -> Dict[str, Any]:
+async def handle_kill_process(args: Dict[str, Any]) -> HandlerResult:
     """Terminate a process by PID"""
+    return await handle_kill_process_kw(pid=args.get("pid"))
+
+
+async def handle_kill_process_kw(pid: Optional[int]) -> HandlerResult:
+    """Terminate a process by PID, taking the tool arguments as keyword arguments"""
     try:
-        pid = args.get("pid")
-        
         if not isinstance(pid, int):
-            return {
-                "content": [{"type": "text", "text": "Error: PID must be an integer"}],
-                "isError": True
-            }
+            return HandlerResult("Error: PID must be an integer", is_error=True)
         
         if pid <= 0:
-            return {
-                "content": [{"type": "text", "text": "Error: Invalid PID"}],
-                "isError": True
-            }
+            return HandlerResult("Error: Invalid PID", is_error=True)
         
         # Safety check: don't allow killing system critical processes
         critical_pids = [0, 1, 2, 4]  # Common system process PIDs
         if pid in critical_pids:
-            return {
-                "content": [{"type": "text", "text": f"Error: Cannot kill system critical process {pid}"}],
-                "isError": True
-            }
+            return HandlerResult(f"Error: Cannot kill system critical process {pid}", is_error=True)
         
         try:
             if sys.platform == "win32":
                 # Windows: use taskkill
-                result = subprocess.run(
-                    ["taskkill", "/F", "/PID", str(pid)],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
+                result = await _run_command(["taskkill", "/F", "/PID", str(pid)], timeout_seconds=5)
                 
                 if result.returncode == 0:
-                    return {
-                        "content": [{"type": "text", "text": f"Successfully terminated process {pid}"}]
-                    }
+                    _invalidate_process_list_cache()
+                    return HandlerResult(f"Successfully terminated process {pid}")
                 else:
-                    return {
-                        "content": [{"type": "text", "text": f"Failed to terminate process {pid}: {result.stderr}"}],
-                        "isError": True
-                    }
+                    return HandlerResult(f"Failed to terminate process {pid}: {result.stderr}", is_error=True)
             else:
                 # Unix/Linux: use os.kill
                 os.kill(pid, signal.SIGTERM)
-                return {
-                    "content": [{"type": "text", "text": f"Successfully sent SIGTERM to process {pid}"}]
-                }
+                _invalidate_process_list_cache()
+                return HandlerResult(f"Successfully sent SIGTERM to process {pid}")
                 
         except ProcessLookupError:
-            return {
-                "content": [{"type": "text", "text": f"Process {pid} not found"}],
-                "isError": True
-            }
+            return HandlerResult(f"Process {pid} not found", is_error=True)
         except PermissionError:
-            return {
-                "content": [{"type": "text", "text": f"Permission denied: cannot kill process {pid}"}],
-                "isError": True
-            }
+            return HandlerResult(f"Permission denied: cannot kill process {pid}", is_error=True)
         except subprocess.TimeoutExpired:
-            return {
-                "content": [{"type": "text", "text": f"Timeout while trying to kill process {pid}"}],
-                "isError": True
-            }
+            return HandlerResult(f"Timeout while trying to kill process {pid}", is_error=True)
             
     except Exception as e:
-        return {
-            "content": [{"type": "text", "text": f"Error killing process: {str(e)}"}],
-            "isError": True
-        }
+        return HandlerResult(f"Error killing process: {str(e)}", is_error=True)
@@ -3,11 +3,10 @@ Terminal command handlers - SIMPLIFIED VERSION
 Based on Desktop Commander MCP pattern that works reliably
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .terminal_manager import ImprovedTerminalManager
 from .command_manager import CommandManager
-from .terminal_types import TerminalError
-import asyncio
+from .terminal_types import HandlerResult, TerminalError
 import time
 import logging
 
@@ -18,28 +17,34 @@ terminal_manager = ImprovedTerminalManager()
 command_manager = CommandManager()
 
 
-async def handle_execute_command(args: Dict[str, Any]) -> Dict[str, Any]:
+async def handle_execute_command(args: Dict[str, Any]) -> HandlerResult:
     """Handler for execute_command tool - Desktop Commander style"""
+    return await handle_execute_command_kw(
+        command=args.get("command", ""),
+        timeout_ms=args.get("timeout_ms", 30000),  # Default 30 seconds
+        shell=args.get("shell"),
+        cwd=args.get("cwd")  # Working directory for command execution
+    )
+
+
+async def handle_execute_command_kw(
+    command: str,
+    timeout_ms: int = 30000,
+    shell: Optional[str] = None,
+    cwd: Optional[str] = None
+) -> HandlerResult:
+    """Handler for execute_command tool, taking the tool arguments as keyword arguments"""
     try:
-        command = args.get("command", "").strip()
-        timeout_ms = args.get("timeout_ms", 30000)  # Default 30 seconds
-        shell = args.get("shell")
-        cwd = args.get("cwd")  # Working directory for command execution
+        command = command.strip()
         
         if not command:
-            return {
-                "content": [{"type": "text", "text": "Error: Command cannot be empty"}],
-                "isError": True
-            }
+            return HandlerResult("Error: Command cannot be empty", is_error=True)
         
         # Simple validation (no complex parsing)
         try:
             validation_result = command_manager.validate_command(command)
             if not validation_result.is_valid:
-                return {
-                    "content": [{"type": "text", "text": f"Error: {validation_result.reason}"}],
-                    "isError": True
-                }
+                return HandlerResult(f"Error: {validation_result.reason}", is_error=True)
         except Exception:
             # If validation fails, continue (fail-safe approach)
             pass
@@ -49,24 +54,16 @@ async def handle_execute_command(args: Dict[str, Any]) -> Dict[str, Any]:
             result = await terminal_manager.execute_command(command, timeout_ms, shell, cwd)
         except Exception as e:
             log.error(f"Error executing command: {e}")
-            return {
-                "content": [{"type": "text", "text": f"Error executing command: {str(e)}"}],
-                "isError": True
-            }
+            return HandlerResult(f"Error executing command: {str(e)}", is_error=True)
         
         if result.pid == -1:
-            return {
-                "content": [{"type": "text", "text": result.initial_output}],
-                "isError": True
-            }
+            return HandlerResult(result.initial_output, is_error=True)
         
         # Build response - Desktop Commander style
         if not result.is_blocked:
             # Command completed - return direct output
             output_text = result.initial_output.strip() if result.initial_output.strip() else "(no output)"
-            return {
-                "content": [{"type": "text", "text": output_text}]
-            }
+            return HandlerResult(output_text)
         else:
             # Command still running - return PID format
             output_text = f"Command started with PID {result.pid}"
@@ -76,29 +73,23 @@ async def handle_execute_command(args: Dict[str, Any]) -> Dict[str, Any]:
             
             output_text += "\nCommand is still running. Use read_output to get more output."
             
-            return {
-                "content": [{"type": "text", "text": output_text}]
-            }
+            return HandlerResult(output_text)
         
     except Exception as e:
         log.error(f"Unexpected error in handle_execute_command: {e}")
-        return {
-            "content": [{"type": "text", "text": f"Unexpected error: {str(e)}"}],
-            "isError": True
-        }
+        return HandlerResult(f"Unexpected error: {str(e)}", is_error=True)
 
 
-async def handle_read_output(args: Dict[str, Any]) -> Dict[str, Any]:
+async def handle_read_output(args: Dict[str, Any]) -> HandlerResult:
     """Handler for read_output tool - Desktop Commander style"""
+    return await handle_read_output_kw(pid=args.get("pid"), timeout_ms=args.get("timeout_ms", 5000))
+
+
+async def handle_read_output_kw(pid: Optional[int], timeout_ms: int = 5000) -> HandlerResult:
+    """Handler for read_output tool, taking the tool arguments as keyword arguments"""
     try:
-        pid = args.get("pid")
-        timeout_ms = args.get("timeout_ms", 5000)
-        
         if not isinstance(pid, int):
-            return {
-                "content": [{"type": "text", "text": "Error: PID must be an integer"}],
-                "isError": True
-            }
+            return HandlerResult("Error: PID must be an integer", is_error=True)
         
         # Check if the process exists first
         session = terminal_manager.get_session(pid)
@@ -106,85 +97,68 @@ async def handle_read_output(args: Dict[str, Any]) -> Dict[str, Any]:
             # Check completed sessions too
             completed_output = terminal_manager.get_new_output(pid)
             if completed_output:
-                return {
-                    "content": [{"type": "text", "text": completed_output}]
-                }
+                return HandlerResult(completed_output)
             else:
-                return {
-                    "content": [{"type": "text", "text": f"No session found for PID {pid}"}],
-                    "isError": True
-                }
+                return HandlerResult(f"No session found for PID {pid}", is_error=True)
         
-        # Desktop Commander style output polling with timeout
+        # Wait for new output with timeout; the session's output event is set whenever output
+        # is appended, so we only wake up when there is something to read
         timeout_seconds = timeout_ms / 1000.0
-        start_time = time.time()
+        deadline = time.monotonic() + timeout_seconds
         
-        while (time.time() - start_time) < timeout_seconds:
+        while True:
+            # Clear before reading, so output appended after the read is not missed
+            session.output_event.clear()
             output = terminal_manager.get_new_output(pid)
             if output and output.strip():
-                return {
-                    "content": [{"type": "text", "text": output}]
-                }
-            await asyncio.sleep(0.3)  # Poll every 300ms like Desktop Commander
+                return HandlerResult(output)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or session.completed_event.is_set():
+                break
+            await session.output_event.wait_async(remaining)
         
         # After timeout, check one more time for any output
         final_output = terminal_manager.get_new_output(pid)
         if final_output and final_output.strip():
-            return {
-                "content": [{"type": "text", "text": final_output}]
-            }
+            return HandlerResult(final_output)
         else:
-            return {
-                "content": [{"type": "text", "text": "No new output available (timeout reached)"}]
-            }
+            return HandlerResult("No new output available (timeout reached)")
         
     except Exception as e:
         log.error(f"Error in handle_read_output: {e}")
-        return {
-            "content": [{"type": "text", "text": f"Error reading output: {str(e)}"}],
-            "isError": True
-        }
+        return HandlerResult(f"Error reading output: {str(e)}", is_error=True)
 
 
-async def handle_force_terminate(args: Dict[str, Any]) -> Dict[str, Any]:
+async def handle_force_terminate(args: Dict[str, Any]) -> HandlerResult:
     """Handler for force_terminate tool - Desktop Commander style"""
+    return await handle_force_terminate_kw(pid=args.get("pid"))
+
+
+async def handle_force_terminate_kw(pid: Optional[int]) -> HandlerResult:
+    """Handler for force_terminate tool, taking the tool arguments as keyword arguments"""
     try:
-        pid = args.get("pid")
-        
         if not isinstance(pid, int):
-            return {
-                "content": [{"type": "text", "text": "Error: PID must be an integer"}],
-                "isError": True
-            }
+            return HandlerResult("Error: PID must be an integer", is_error=True)
         
         success = terminal_manager.force_terminate(pid)
         
         if success:
-            return {
-                "content": [{"type": "text", "text": f"Successfully initiated termination of session {pid}"}]
-            }
+            return HandlerResult(f"Successfully initiated termination of session {pid}")
         else:
-            return {
-                "content": [{"type": "text", "text": f"No active session found for PID {pid}"}]
-            }
+            return HandlerResult(f"No active session found for PID {pid}")
             
     except Exception as e:
         log.error(f"Error in handle_force_terminate: {e}")
-        return {
-            "content": [{"type": "text", "text": f"Error terminating session: {str(e)}"}],
-            "isError": True
-        }
+        return HandlerResult(f"Error terminating session: {str(e)}", is_error=True)
 
 
-async def handle_list_sessions(args: Dict[str, Any]) -> Dict[str, Any]:
-    """Handler for list_sessions tool - Desktop Commander style"""
+async def handle_list_sessions(args: Optional[Dict[str, Any]] = None) -> HandlerResult:
+    """Handler for list_sessions tool (which takes no arguments) - Desktop Commander style"""
     try:
         sessions = terminal_manager.list_active_sessions()
         
         if not sessions:
-            return {
-                "content": [{"type": "text", "text": "No active sessions"}]
-            }
+            return HandlerResult("No active sessions")
         
         session_info = []
         for session in sessions:
@@ -194,13 +168,8 @@ async def handle_list_sessions(args: Dict[str, Any]) -> Dict[str, Any]:
                 f"Runtime: {session.runtime_seconds:.1f}s"
             )
         
-        return {
-            "content": [{"type": "text", "text": "\n".join(session_info)}]
-        }
+        return HandlerResult("\n".join(session_info))
         
     except Exception as e:
         log.error(f"Error in handle_list_sessions: {e}")
-        return {
-            "content": [{"type": "text", "text": f"Error listing sessions: {str(e)}"}],
-            "isError": True
-        }
+        return HandlerResult(f"Error listing sessions: {str(e)}", is_error=True)
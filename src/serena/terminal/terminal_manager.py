@@ -1,36 +1,121 @@
+import codecs
+import functools
+import io
+import locale
+import os
+import selectors
 import subprocess
 import threading
 import time
 import sys
-from datetime import datetime
-from typing import Dict, Optional, List
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Optional, List, Tuple
 import logging
+from ..util.async_utils import run_blocking
 from .terminal_types import (TerminalSession, CommandExecutionResult, ActiveSessionInfo, CompletedSession)
 
 log = logging.getLogger(__name__)
 
+# Maximum number of bytes read from a process's output at once
+_READ_CHUNK_SIZE = 65536
+# Encoding of process output (the same as used by text-mode pipes)
+_OUTPUT_ENCODING = locale.getpreferredencoding(False)
+# Maximum time to wait for the remaining output of a process which has exited
+# (its output may be held open by background processes it started)
+_OUTPUT_DRAIN_TIMEOUT_SECONDS = 0.1
+
+
+class _OutputCollector:
+    """
+    Collects the output of the sessions of all terminal managers in a single thread (not used on Windows),
+    waking up only when output is available
+    """
+
+    def __init__(self) -> None:
+        self._selector = selectors.DefaultSelector()
+        # Sessions to be registered with the selector, together with their managers
+        self._pending: Deque[Tuple["ImprovedTerminalManager", TerminalSession]] = deque()
+        self._wakeup_read_fd, self._wakeup_write_fd = os.pipe()
+        self._selector.register(self._wakeup_read_fd, selectors.EVENT_READ)
+        threading.Thread(target=self._run, name="serena-terminal-output", daemon=True).start()
+
+    def add(self, manager: "ImprovedTerminalManager", session: TerminalSession) -> None:
+        # The selector is only modified by the collector's own thread; hand the session over and wake it up
+        self._pending.append((manager, session))
+        os.write(self._wakeup_write_fd, b"\0")
+
+    def _run(self) -> None:
+        while True:
+            try:
+                for key, _ in self._selector.select():
+                    if key.fd == self._wakeup_read_fd:
+                        os.read(self._wakeup_read_fd, 4096)
+                        while self._pending:
+                            manager, session = self._pending.popleft()
+                            try:
+                                self._selector.register(session.process.stdout, selectors.EVENT_READ,
+                                                        (manager, session, manager._create_output_decoder()))
+                            except (OSError, ValueError):
+                                # Fall back to a dedicated reader thread for this session
+                                threading.Thread(target=manager._handle_process_lifecycle, args=(session,), daemon=True).start()
+                        continue
+                    
+                    manager, session, decoder = key.data
+                    try:
+                        data = os.read(key.fd, _READ_CHUNK_SIZE)
+                    except OSError:
+                        data = b""
+                    manager._append_output(session, decoder.decode(data, final=not data))
+                    if not data:
+                        # The process closed its output; wait for it to exit without blocking the other sessions
+                        self._selector.unregister(key.fileobj)
+                        session.process.stdout.close()
+                        if session.process.poll() is None:
+                            threading.Thread(target=manager._complete_session, args=(session,), daemon=True).start()
+                        else:
+                            manager._complete_session(session)
+            except Exception as e:
+                log.error(f"Error collecting process output: {e}")
+
+
+_output_collector: Optional[_OutputCollector] = None
+_output_collector_lock = threading.Lock()
+
+
+def _get_output_collector() -> _OutputCollector:
+    global _output_collector
+    if _output_collector is None:
+        with _output_collector_lock:
+            if _output_collector is None:
+                _output_collector = _OutputCollector()
+    return _output_collector
+
+
 class ImprovedTerminalManager:
     """Simple, reliable terminal manager based on Desktop Commander pattern"""
     
     def __init__(self, max_completed_sessions: int = 100):
         self.sessions: Dict[int, TerminalSession] = {}
-        self.completed_sessions: Dict[int, CompletedSession] = {}
+        # Completed sessions in order of completion, oldest first
+        self.completed_sessions: OrderedDict[int, CompletedSession] = OrderedDict()
         self.max_completed_sessions = max_completed_sessions
-        self._lock = threading.Lock()
+        # Guards the structure of sessions and completed_sessions; output of a single
+        # session is guarded by the session's own lock
+        self._registry_lock = threading.Lock()
 
     async def execute_command(self, command: str, timeout_ms: int = 30000, shell: Optional[str] = None, cwd: Optional[str] = None) -> CommandExecutionResult:
         """Execute command with proper timeout handling - Desktop Commander style"""
         try:
-            # Start process
-            process = subprocess.Popen(
+            # Start process (in a worker thread, since spawning it blocks)
+            process = await run_blocking(functools.partial(
+                subprocess.Popen,
                 command,
                 shell=True,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1,
                 cwd=cwd  # Set working directory if provided
-            )
+            ))
             
             if process.pid is None:
                 return CommandExecutionResult(
@@ -45,58 +130,34 @@ class ImprovedTerminalManager:
                 process=process,
                 command=command,
                 start_time=datetime.now(),
-                output_lines=[],
-                last_read_offset=0,
                 is_blocked_flag=False
             )
             
-            with self._lock:
+            with self._registry_lock:
                 self.sessions[process.pid] = session
 
-            # Start background thread for continuous output collection
-            threading.Thread(
-                target=self._handle_process_lifecycle, 
-                args=(session,), 
-                daemon=True
-            ).start()
+            # Start continuous output collection in the background
+            self._start_output_collection(session)
+            # Wait for the process to exit in a daemon thread, which notifies waiting coroutines via the session's event
+            threading.Thread(target=self._wait_for_exit, args=(session,), daemon=True).start()
             
-            # Wait for timeout or completion - Desktop Commander style
+            # Wait for the process to exit or timeout - Desktop Commander style.
+            # No thread is occupied by the wait, so it neither blocks the event loop nor interpreter shutdown.
             timeout_seconds = timeout_ms / 1000.0
-            initial_output = ""
-            start_time = time.time()
+            exited = await session.exited_event.wait_async(timeout_seconds)
+            if exited:
+                # Give output collection a moment to pick up the remaining output
+                await session.completed_event.wait_async(_OUTPUT_DRAIN_TIMEOUT_SECONDS)
             
-            # Collect output during timeout period
-            while (time.time() - start_time) < timeout_seconds:
-                # Check if process completed
-                if process.poll() is not None:
-                    # Process finished - collect all output and return it directly
-                    time.sleep(0.1)  # Give time for output collection
-                    with self._lock:
-                        initial_output = ''.join(session.output_lines)
-                    
-                    return CommandExecutionResult(
-                        pid=process.pid,
-                        initial_output=initial_output,
-                        is_blocked=False  # Command completed
-                    )
-                
-                # Process still running - collect partial output
-                with self._lock:
-                    current_output = ''.join(session.output_lines)
-                    if current_output != initial_output:
-                        initial_output = current_output
-                
-                time.sleep(0.1)  # Small sleep to prevent busy waiting
-            
-            # Timeout reached and process still running
-            with self._lock:
-                session.is_blocked_flag = True
-                initial_output = ''.join(session.output_lines)
+            with session.lock:
+                if not exited:
+                    session.is_blocked_flag = True
+                initial_output = session.output.getvalue()
             
             return CommandExecutionResult(
                 pid=process.pid,
                 initial_output=initial_output,
-                is_blocked=True  # Command still running after timeout
+                is_blocked=not exited  # True if command is still running after timeout
             )
             
         except Exception as e:
@@ -107,34 +168,67 @@ class ImprovedTerminalManager:
                 is_blocked=False
             )
 
+    @staticmethod
+    def _wait_for_exit(session: TerminalSession) -> None:
+        """Wait for the session's process to exit and set the session's exited event"""
+        try:
+            session.process.wait()
+        except Exception as e:
+            log.error(f"Error waiting for process {session.pid}: {e}")
+        finally:
+            session.exited_event.set()
+
+    @staticmethod
+    def _create_output_decoder() -> io.IncrementalNewlineDecoder:
+        # Decode incrementally, so that multi-byte characters may span chunks
+        return io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(_OUTPUT_ENCODING)(errors="replace"), translate=True
+        )
+
+    @staticmethod
+    def _append_output(session: TerminalSession, text: str) -> None:
+        if text:
+            with session.lock:
+                session.output.append(text)
+            session.output_event.set()
+
+    def _start_output_collection(self, session: TerminalSession) -> None:
+        """Start collecting the output of the session's process in the background"""
+        if sys.platform == "win32":
+            # Pipes cannot be used with selectors on Windows, so each session gets its own reader thread
+            threading.Thread(
+                target=self._handle_process_lifecycle,
+                args=(session,),
+                daemon=True
+            ).start()
+            return
+        
+        _get_output_collector().add(self, session)
+
     def _handle_process_lifecycle(self, session: TerminalSession) -> None:
         """Handle process completion - Desktop Commander style"""
+        # Read raw output in large chunks until the process closes stdout (read1 blocks until data is available)
+        decoder = self._create_output_decoder()
         try:
-            # Continue reading output until process completes
-            while session.process.poll() is None:
-                try:
-                    line = session.process.stdout.readline()
-                    if line:
-                        with self._lock:
-                            session.output_lines.append(line)
-                    else:
-                        time.sleep(0.1)
-                except Exception:
+            while True:
+                data = session.process.stdout.read1(_READ_CHUNK_SIZE)
+                self._append_output(session, decoder.decode(data, final=not data))
+                if not data:
                     break
-            
-            # Read any remaining output
-            try:
-                remaining = session.process.stdout.read()
-                if remaining:
-                    with self._lock:
-                        session.output_lines.append(remaining)
-            except Exception:
-                pass
-            
+        except Exception:
+            pass
+        
+        self._complete_session(session)
+
+    def _complete_session(self, session: TerminalSession) -> None:
+        """Wait for the session's process to exit and move the session to the completed sessions"""
+        try:
             # Store completed session
-            exit_code = session.process.returncode
-            end_time = datetime.now()
-            final_output = ''.join(session.output_lines)
+            exit_code = session.process.wait()
+            end_time = session.start_time + timedelta(seconds=time.monotonic() - session.start_monotonic)
+            with session.lock:
+                final_output = session.output.getvalue()
+                session.exit_code = exit_code
             
             completed = CompletedSession(
                 pid=session.pid,
@@ -145,40 +239,45 @@ class ImprovedTerminalManager:
                 end_time=end_time
             )
             
-            with self._lock:
+            with self._registry_lock:
                 self.completed_sessions[session.pid] = completed
+                # A reused PID counts as the most recently completed session
+                self.completed_sessions.move_to_end(session.pid)
                 if session.pid in self.sessions:
                     del self.sessions[session.pid]
                 
                 # Keep only last N completed sessions
                 if len(self.completed_sessions) > self.max_completed_sessions:
-                    oldest_pid = min(self.completed_sessions.keys())
-                    del self.completed_sessions[oldest_pid]
+                    self.completed_sessions.popitem(last=False)
                     
         except Exception as e:
             log.error(f"Error handling process lifecycle: {e}")
+        finally:
+            # Wake up anyone waiting for output or completion
+            session.completed_event.set()
+            session.output_event.set()
 
     def get_new_output(self, pid: int) -> Optional[str]:
         """Get new output since last read - Desktop Commander style"""
-        with self._lock:
-            # Check active sessions first
+        with self._registry_lock:
+            # Check active sessions first, then completed sessions
             session = self.sessions.get(pid)
-            if session:
-                new_lines = session.output_lines[session.last_read_offset:]
-                session.last_read_offset = len(session.output_lines)
-                return ''.join(new_lines)
-            
-            # Check completed sessions
-            completed_session = self.completed_sessions.get(pid)
-            if completed_session:
-                runtime = completed_session.runtime_seconds
-                return f"Process completed with exit code {completed_session.exit_code}\nRuntime: {runtime:.2f}s\nFinal output:\n{completed_session.final_output}"
-            
-            return None
+            completed_session = self.completed_sessions.get(pid) if session is None else None
+        
+        if session:
+            with session.lock:
+                new_output = session.output.read_new()
+            return new_output
+        
+        if completed_session:
+            runtime = completed_session.runtime_seconds
+            return f"Process completed with exit code {completed_session.exit_code}\nRuntime: {runtime:.2f}s\nFinal output:\n{completed_session.final_output}"
+        
+        return None
 
     def force_terminate(self, pid: int) -> bool:
         """Terminate process - Desktop Commander style"""
-        with self._lock:
+        with self._registry_lock:
             session = self.sessions.get(pid)
             if not session:
                 return False
@@ -213,25 +312,29 @@ class ImprovedTerminalManager:
 
     def get_session(self, pid: int) -> Optional[TerminalSession]:
         """Get session by PID"""
-        with self._lock:
+        with self._registry_lock:
             return self.sessions.get(pid)
 
     def list_active_sessions(self) -> List[ActiveSessionInfo]:
         """List all active sessions"""
-        now = datetime.now()
-        with self._lock:
-            return [
-                ActiveSessionInfo(
-                    pid=session.pid,
-                    command=session.command,
-                    is_blocked=session.is_blocked_flag,
-                    runtime_seconds=(now - session.start_time).total_seconds(),
-                    start_time=session.start_time
-                )
-                for session in self.sessions.values()
-            ]
+        now = time.monotonic()
+        with self._registry_lock:
+            sessions = list(self.sessions.values())
+        
+        active_sessions = []
+        for session in sessions:
+            with session.lock:
+                is_blocked = session.is_blocked_flag
+            active_sessions.append(ActiveSessionInfo(
+                pid=session.pid,
+                command=session.command,
+                is_blocked=is_blocked,
+                runtime_seconds=now - session.start_monotonic,
+                start_time=session.start_time
+            ))
+        return active_sessions
 
     def list_completed_sessions(self) -> List[CompletedSession]:
         """List all completed sessions"""
-        with self._lock:
+        with self._registry_lock:
             return list(self.completed_sessions.values())
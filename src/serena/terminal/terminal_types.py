@@ -3,31 +3,113 @@ Types and data structures for terminal management system.
 Based on Desktop Commander MCP Server terminal functionality.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
 from subprocess import Popen
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Deque
+import threading
+import time
+from typing import Optional, Dict, Any, List, Deque, NamedTuple
 from enum import Enum
 import asyncio # For asyncio.subprocess.Process and asyncio.Task
-
-
-@dataclass
+from ..util.async_utils import AwaitableEvent
+
+
+def _omitted_output_marker(length: int) -> str:
+    return f"[... {length} characters of earlier output omitted ...]\n"
+
+
+class OutputBuffer:
+    """
+    Buffer of output chunks which retains (about) the last max_length characters of output
+    and keeps track of how much of it has not been read yet.
+    Appending and reading new output only touch the chunks involved, never the whole output.
+    Output which had to be dropped is indicated by a marker at the start of the returned output.
+    """
+
+    def __init__(self, max_length: int = 1_000_000) -> None:
+        self.max_length = max_length
+        self._chunks: Deque[str] = deque()
+        # Number of characters in _chunks
+        self._length = 0
+        # Number of characters dropped from the start of the output
+        self._dropped_length = 0
+        # Number of characters at the end of _chunks which have not been returned by read_new yet
+        self._unread_length = 0
+        # Number of characters dropped before they were returned by read_new
+        self._unread_dropped_length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        self._unread_length += len(chunk)
+        # Drop the oldest chunks as long as the remaining ones still hold max_length characters
+        while self._length - len(self._chunks[0]) >= self.max_length:
+            dropped_length = len(self._chunks.popleft())
+            self._length -= dropped_length
+            self._dropped_length += dropped_length
+        if self._unread_length > self._length:
+            self._unread_dropped_length += self._unread_length - self._length
+            self._unread_length = self._length
+
+    def read_new(self) -> str:
+        """Get all output appended since the last call (as far as it is still retained)"""
+        remaining = self._unread_length
+        marker = _omitted_output_marker(self._unread_dropped_length) if self._unread_dropped_length else ""
+        self._unread_length = 0
+        self._unread_dropped_length = 0
+        if remaining == 0:
+            return marker
+        parts = []
+        for chunk in reversed(self._chunks):
+            if len(chunk) >= remaining:
+                parts.append(chunk[len(chunk) - remaining:])
+                break
+            parts.append(chunk)
+            remaining -= len(chunk)
+        parts.append(marker)
+        return ''.join(reversed(parts))
+
+    def getvalue(self) -> str:
+        if len(self._chunks) > 1:
+            # Compact into a single chunk, so that repeated calls don't join the whole output again
+            self._chunks = deque([''.join(self._chunks)])
+        value = self._chunks[0] if self._chunks else ""
+        if self._dropped_length:
+            value = _omitted_output_marker(self._dropped_length) + value
+        return value
+
+
+@dataclass(slots=True)
 class TerminalSession:
     """Represents an active terminal session being managed."""
     pid: int
     process: any  # subprocess.Popen process
     command: str
     start_time: datetime
-    output_lines: List[str] = field(default_factory=list)
-    # Tracks how much of output_lines has been sent by get_new_output
-    last_read_offset: int = 0
+    # Monotonic clock reading at start_time, for computing runtimes
+    start_monotonic: float = field(default_factory=time.monotonic)
+    output: OutputBuffer = field(default_factory=OutputBuffer)
     # True if execute_command returned while this session was still running
     is_blocked_flag: bool = False
     # Store the exit code once known, even before moving to CompletedSession
     exit_code: Optional[int] = None
+    # Guards output and is_blocked_flag
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Set whenever new output is appended, so readers can wait instead of polling
+    output_event: AwaitableEvent = field(default_factory=AwaitableEvent)
+    # Set once the process has exited (its output may still be collected)
+    exited_event: AwaitableEvent = field(default_factory=AwaitableEvent)
+    # Set once the process has exited and all of its output has been collected
+    completed_event: AwaitableEvent = field(default_factory=AwaitableEvent)
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandExecutionResult:
     """Result of a command execution, returned by the manager's execute_command."""
     pid: Optional[int] = None
@@ -36,7 +118,7 @@ class CommandExecutionResult:
     error_message: Optional[str] = None # For errors like failing to start the process
 
 
-@dataclass
+@dataclass(slots=True)
 class ActiveSessionInfo:
     """Brief information about an active session, for listing."""
     pid: int
@@ -46,7 +128,7 @@ class ActiveSessionInfo:
     start_time: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class CompletedSession:
     """Represents a terminal session that has finished."""
     pid: int
@@ -61,7 +143,7 @@ class CompletedSession:
         return (self.end_time - self.start_time).total_seconds()
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessInfo:
     """System process information"""
     pid: int
@@ -70,11 +152,17 @@ class ProcessInfo:
     memory: str
 
 
-class CommandValidationResult:
+@dataclass(slots=True)
+class HandlerResult:
+    """Result of a terminal tool handler"""
+    text: str
+    is_error: bool = False
+
+
+class CommandValidationResult(NamedTuple):
     """Result of command validation"""
-    def __init__(self, is_valid: bool, reason: str = ""):
-        self.is_valid = is_valid
-        self.reason = reason
+    is_valid: bool
+    reason: str = ""
 
 
 class TerminalError(Exception):
@@ -89,16 +177,20 @@ class ServerSentEvent(Enum):
     TERMINAL_OUTPUT = "terminal_output"
 
 
-@dataclass
+# Values of the event types, looked up once instead of through the Enum.value property per event
+_SSE_VALUES: Dict[ServerSentEvent, str] = {e: e.value for e in ServerSentEvent}
+
+
+@dataclass(slots=True)
 class ServerSentEventData:
     type: ServerSentEvent
     text: str
 
     def to_dict(self) -> Dict[str, Any]:
-        return {"type": self.type.value, "text": self.text}
+        return {"type": _SSE_VALUES[self.type], "text": self.text}
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerResultContent:
     type: str # Should be "text" for now, mirroring client expectations
     text: str
@@ -106,7 +198,7 @@ class ServerResultContent:
     def to_dict(self) -> Dict[str, Any]:
         return {"type": self.type, "text": self.text}
 
-@dataclass
+@dataclass(slots=True)
 class ServerResultDict:
     content: List[ServerResultContent] = field(default_factory=list)
     isError: bool = False
@@ -117,7 +209,8 @@ class ServerResultDict:
 
     def to_dict(self) -> Dict[str, Any]:
         return {
-            "content": [c.to_dict() for c in self.content],
+            # Build the content dicts inline instead of calling ServerResultContent.to_dict per item
+            "content": [{"type": c.type, "text": c.text} for c in self.content],
             "isError": self.isError,
             # "tool_name": self.tool_name, # Not sending to client
             # "tool_input": self.tool_input # Not sending to client
@@ -1,7 +1,131 @@
 import asyncio
+import sys
 import threading
 import concurrent.futures
-from typing import Any, Coroutine, Optional
+from typing import Any, Callable, Coroutine, List, Optional, Tuple
+
+if sys.platform != "win32":
+    try:
+        import uvloop
+    except ImportError:
+        # Fall back to the default asyncio event loop
+        uvloop = None
+else:
+    # Keep the default (proactor) event loop on Windows
+    uvloop = None
+
+# Thread pool shared by all (short) blocking calls made from coroutines (see run_blocking); created on first use.
+# Note that the interpreter waits for running workers at exit, so long waits should use AwaitableEvent instead.
+_EXECUTOR: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_EXECUTOR_MAX_WORKERS = 32
+_executor_lock = threading.Lock()
+
+# Long-lived event loop running in a daemon thread, in which all coroutines passed to
+# run_coroutine_synchronously are run; created on first use
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+# Additional time the calling thread waits for a coroutine's result beyond its timeout, in case the
+# timeout cannot be enforced within the background loop (because the loop is blocked)
+_RESULT_TIMEOUT_GRACE_SECONDS = 1.0
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _executor_lock:
+            if _EXECUTOR is None:
+                _EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=_EXECUTOR_MAX_WORKERS, thread_name_prefix="serena-async")
+    return _EXECUTOR
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Runs a blocking function in the shared thread pool and awaits its result, without blocking the event loop.
+    Unlike asyncio.to_thread, this does not create a new thread pool for every event loop.
+    """
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), func, *args)
+
+
+def _resolve_waiter(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AwaitableEvent:
+    """
+    A thread-safe event (like threading.Event) which coroutines can also wait for without occupying a thread:
+    setting the event notifies waiting event loops directly.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    def set(self) -> None:
+        with self._lock:
+            self._event.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve_waiter, future)
+            except RuntimeError:
+                # The waiting loop has been closed
+                pass
+
+    def clear(self) -> None:
+        self._event.clear()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the event is set or the timeout expires, returning whether the event is set"""
+        return self._event.wait(timeout)
+
+    async def wait_async(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the event is set or the timeout expires, returning whether the event is set"""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        waiter = (loop, future)
+        with self._lock:
+            if self._event.is_set():
+                return True
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                # Use uvloop if available, which reduces the overhead of the loop's subprocess and pipe I/O.
+                # Only this loop is affected; the global event loop policy is left unchanged.
+                loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+                loop.set_default_executor(_get_executor())
+                threading.Thread(target=loop.run_forever, name="serena-async-loop", daemon=True).start()
+                _background_loop = loop
+    return _background_loop
+
+
+async def _run_with_timeout(coro: Coroutine[Any, Any, Any], timeout_seconds: float) -> Any:
+    """Awaits the coroutine, cancelling it and raising TimeoutError if it does not complete in time"""
+    task = asyncio.ensure_future(coro)
+    done, _ = await asyncio.wait({task}, timeout=timeout_seconds, return_when=asyncio.FIRST_COMPLETED)
+    if not done:
+        task.cancel()
+        raise TimeoutError(f"Coroutine execution timed out after {timeout_seconds} seconds")
+    return task.result()
+
 
 def run_coroutine_synchronously(
     coro: Coroutine[Any, Any, Any], 
@@ -11,7 +135,7 @@ def run_coroutine_synchronously(
     Runs an asyncio coroutine and blocks until it completes, returning the result.
     This function handles cases where an event loop may or may not be running
     in the current thread.
-
+    
     Args:
         coro: The coroutine to run
         timeout_seconds: Maximum time to wait (None for no timeout)
@@ -23,67 +147,49 @@ def run_coroutine_synchronously(
         TimeoutError: If timeout_seconds is exceeded
         Exception: Any exception raised by the coroutine
     """
+    background_loop = _get_background_loop()
     try:
-        # Check if an event loop is already running in the current thread.
-        asyncio.get_running_loop()
-        is_loop_running = True
+        running_loop = asyncio.get_running_loop()
     except RuntimeError:
-        is_loop_running = False
-
-    if not is_loop_running:
-        # Safe to use asyncio.run() as it will create and manage a new event loop.
-        if timeout_seconds is not None:
-            return asyncio.run(asyncio.wait_for(coro, timeout=timeout_seconds))
-        else:
-            return asyncio.run(coro)
-    else:
-        # An event loop is already running.
-        # Run the coroutine in a separate thread with its own event loop.
-        result = None
-        exception = None
-        
-        def target_thread_func():
-            nonlocal result, exception
-            try:
-                if timeout_seconds is not None:
-                    result = asyncio.run(asyncio.wait_for(coro, timeout=timeout_seconds))
-                else:
-                    result = asyncio.run(coro)
-            except Exception as e:
-                exception = e
-        
-        # Use ThreadPoolExecutor with timeout
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(target_thread_func)
-            try:
-                # Add buffer time to thread timeout
-                thread_timeout = timeout_seconds + 5 if timeout_seconds else None
-                future.result(timeout=thread_timeout)
-            except concurrent.futures.TimeoutError:
-                raise TimeoutError(f"Coroutine execution timed out after {timeout_seconds} seconds")
-        
-        if exception:
-            raise exception
-        return result
+        running_loop = None
+    if running_loop is background_loop:
+        # Blocking the background loop while waiting for it would deadlock
+        coro.close()
+        raise RuntimeError("Cannot run a coroutine synchronously from within the background event loop")
+
+    # Run the coroutine in the background event loop. This avoids creating (and closing) a new event loop
+    # per call and never blocks an event loop which may be running in the current thread.
+    # The timeout is enforced within the loop; the calling thread's wait is bounded as well,
+    # so it does not hang if the loop is blocked.
+    if timeout_seconds is None:
+        return asyncio.run_coroutine_threadsafe(coro, background_loop).result()
+    future = asyncio.run_coroutine_threadsafe(_run_with_timeout(coro, timeout_seconds), background_loop)
+    try:
+        return future.result(timeout=timeout_seconds + _RESULT_TIMEOUT_GRACE_SECONDS)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Coroutine execution timed out after {timeout_seconds} seconds")
 
 
 def run_coroutine_with_timeout(
     coro: Coroutine[Any, Any, Any], 
     timeout_seconds: float,
-    default_result: Any = None
+    default_factory: Optional[Callable[[], Any]] = None
 ) -> Any:
     """
-    Runs a coroutine with timeout, returning default_result if timeout occurs.
+    Runs a coroutine with timeout, returning a default result if timeout occurs.
     
     Args:
         coro: The coroutine to run
         timeout_seconds: Maximum time to wait
-        default_result: Value to return if timeout occurs
+        default_factory: Function creating the value to return if timeout occurs (only called then);
+            if None, None is returned
         
     Returns:
-        The result of the coroutine or default_result if timeout
+        The result of the coroutine or the default result if timeout
     """
     try:
         return run_coroutine_synchronously(coro, timeout_seconds)
-    except (TimeoutError, asyncio.TimeoutError):
-        return default_result
+    # asyncio.TimeoutError is an alias of the builtin TimeoutError since Python 3.11
+    except TimeoutError:
+        return default_factory() if default_factory is not None else None
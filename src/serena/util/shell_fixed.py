@@ -1,9 +1,15 @@
 import os
-import platform
+import shlex
+import shutil
 import subprocess
+import sys
+from collections.abc import Callable
+from functools import lru_cache
 
 from pydantic import BaseModel
 
+_IS_WINDOWS = sys.platform.startswith("win")
+
 
 class ShellCommandResult(BaseModel):
     stdout: str
@@ -12,6 +18,88 @@ class ShellCommandResult(BaseModel):
     stderr: str | None = None
 
 
+@lru_cache(maxsize=256)
+def _split_command(command: str) -> tuple[str, ...]:
+    """Splits the command into tokens like a POSIX shell would; returns an empty tuple if it cannot be split"""
+    try:
+        return tuple(shlex.split(command))
+    except ValueError:
+        return ()
+
+
+@lru_cache(maxsize=256)
+def _find_executable(name: str) -> str | None:
+    """Finds the executable with the given name (not path) on the PATH"""
+    return shutil.which(name)
+
+
+def _decode_output(data: bytes) -> str:
+    """Decodes process output as UTF-8, translating newlines like text mode pipes do"""
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+# Windows command execution approaches, in order of preference
+def _popen_windows_shell(command: str, cwd: str | None, capture_stderr: bool) -> subprocess.Popen:
+    # Approach 1: Use shell=True with original command
+    return subprocess.Popen(
+        command,
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if capture_stderr else None,
+        cwd=cwd,
+    )
+
+
+def _popen_windows_cmd(command: str, cwd: str | None, capture_stderr: bool) -> subprocess.Popen:
+    # Approach 2: Use cmd.exe explicitly
+    return subprocess.Popen(
+        f"cmd /c {command}",
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if capture_stderr else None,
+        cwd=cwd,
+    )
+
+
+def _popen_windows_cmd_list(command: str, cwd: str | None, capture_stderr: bool) -> subprocess.Popen:
+    # Approach 3: Use cmd.exe as list
+    return subprocess.Popen(
+        ["cmd", "/c", command],
+        shell=False,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if capture_stderr else None,
+        cwd=cwd,
+    )
+
+
+# The first Windows approach that works on this system, determined on first use
+_WIN_LAUNCHER: Callable[[str, str | None, bool], subprocess.Popen] | None = None
+
+
+def _get_windows_launcher() -> Callable[[str, str | None, bool], subprocess.Popen]:
+    """
+    Determines the Windows command execution approach to use by running a trivial command with each
+    approach until one works. Which approach works depends only on the system, so this is done once.
+    """
+    global _WIN_LAUNCHER
+    if _WIN_LAUNCHER is not None:
+        return _WIN_LAUNCHER
+    last_error: OSError | None = None
+    for approach in (_popen_windows_shell, _popen_windows_cmd, _popen_windows_cmd_list):
+        try:
+            approach("cd", None, False).communicate()
+        except (FileNotFoundError, OSError) as e:
+            last_error = e
+            continue
+        _WIN_LAUNCHER = approach
+        return approach
+    # All approaches failed
+    raise FileNotFoundError(f"All Windows command execution approaches failed. Last error: {last_error}")
+
+
 def execute_shell_command(command: str, cwd: str | None = None, capture_stderr: bool = False) -> ShellCommandResult:
     """
     Execute a shell command and return the output.
@@ -25,81 +113,43 @@ def execute_shell_command(command: str, cwd: str | None = None, capture_stderr:
         cwd = os.getcwd()
 
     # Comprehensive Windows fix with multiple fallback approaches
-    is_windows = platform.system() == "Windows"
+    is_windows = _IS_WINDOWS
     
     if is_windows:
-        # Windows-specific handling with fallbacks
-        approaches = [
-            # Approach 1: Use shell=True with original command
-            lambda: subprocess.Popen(
-                command,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE if capture_stderr else None,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                cwd=cwd,
-            ),
-            # Approach 2: Use cmd.exe explicitly
-            lambda: subprocess.Popen(
-                f"cmd /c {command}",
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE if capture_stderr else None,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                cwd=cwd,
-            ),
-            # Approach 3: Use cmd.exe as list
-            lambda: subprocess.Popen(
-                ["cmd", "/c", command],
-                shell=False,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE if capture_stderr else None,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                cwd=cwd,
-            ),
-        ]
-        
-        # Try each approach until one works
-        for i, approach in enumerate(approaches):
-            try:
-                process = approach()
-                break
-            except (FileNotFoundError, OSError) as e:
-                if i == len(approaches) - 1:  # Last approach failed
-                    raise FileNotFoundError(f"All Windows command execution approaches failed. Last error: {e}")
-                continue
+        process = _get_windows_launcher()(command, cwd, capture_stderr)
     else:
         # Unix-like systems - use shell=False for better security
-        try:
-            # Try as list first (safer)
-            process = subprocess.Popen(
-                command.split() if isinstance(command, str) else command,
-                shell=False,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE if capture_stderr else None,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                cwd=cwd,
-            )
-        except (FileNotFoundError, OSError):
+        list_process: subprocess.Popen | None = None
+        tokens = _split_command(command) if isinstance(command, str) else tuple(command)
+        # Try as list first (safer), provided that the executable can be found
+        if tokens and (os.sep in tokens[0] or _find_executable(tokens[0]) is not None):
+            try:
+                list_process = subprocess.Popen(
+                    list(tokens),
+                    shell=False,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE if capture_stderr else None,
+                    cwd=cwd,
+                )
+            except (FileNotFoundError, OSError):
+                pass
+        if list_process is not None:
+            process = list_process
+        else:
             # Fallback to shell=True for complex commands
             process = subprocess.Popen(
                 command,
                 shell=True,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE if capture_stderr else None,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
                 cwd=cwd,
             )
 
+    # The output is read as raw bytes (communicate reads both pipes concurrently) and decoded once
     stdout, stderr = process.communicate()
-    return ShellCommandResult(stdout=stdout, stderr=stderr, return_code=process.returncode, cwd=cwd)
+    return ShellCommandResult(
+        stdout=_decode_output(stdout),
+        stderr=_decode_output(stderr) if stderr is not None else None,
+        return_code=process.returncode,
+        cwd=cwd,
+    )
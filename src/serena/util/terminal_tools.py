@@ -5,12 +5,13 @@ Fixed terminal tools with timeout handling.
 import asyncio
 from typing import Optional
 from ..terminal import (
-    handle_execute_command,
-    handle_read_output,
-    handle_force_terminate,
+    handle_execute_command_kw,
+    handle_read_output_kw,
+    handle_force_terminate_kw,
     handle_list_sessions,
     handle_list_processes,
-    handle_kill_process
+    handle_kill_process_kw,
+    HandlerResult
 )
 from .async_utils import run_coroutine_with_timeout
 
@@ -20,28 +21,17 @@ class TerminalExecutorLogic:
     def execute(self, command: str, timeout_ms: int = 30000, shell: Optional[str] = None, cwd: Optional[str] = None) -> str:
         """Execute a terminal command with timeout."""
         try:
-            coro = handle_execute_command({
-                "command": command,
-                "timeout_ms": timeout_ms,
-                "shell": shell,
-                "cwd": cwd
-            })
+            coro = handle_execute_command_kw(command=command, timeout_ms=timeout_ms, shell=shell, cwd=cwd)
             
             sync_timeout_seconds = (timeout_ms / 1000.0) + 10
             
             result = run_coroutine_with_timeout(
                 coro,
                 timeout_seconds=sync_timeout_seconds,
-                default_result={
-                    "content": [{"type": "text", "text": f"Command timed out."}],
-                    "isError": True
-                }
+                default_factory=lambda: HandlerResult(f"Command timed out.", is_error=True)
             )
             
-            if result.get("isError"):
-                return f"Error: {result['content'][0]['text']}"
-            
-            return result["content"][0]["text"]
+            return ("Error: " if result.is_error else "") + result.text
             
         except Exception as e:
             return f"Error executing command: {str(e)}"
@@ -53,26 +43,17 @@ class TerminalReaderLogic:
     def read(self, pid: int, timeout_ms: int = 5000) -> str:
         """Read new output from a running terminal session."""
         try:
-            coro = handle_read_output({
-                "pid": pid,
-                "timeout_ms": timeout_ms
-            })
+            coro = handle_read_output_kw(pid=pid, timeout_ms=timeout_ms)
             
             sync_timeout_seconds = (timeout_ms / 1000.0) + 5
             
             result = run_coroutine_with_timeout(
                 coro,
                 timeout_seconds=sync_timeout_seconds,
-                default_result={
-                    "content": [{"type": "text", "text": f"Read output timed out for PID {pid}"}],
-                    "isError": True
-                }
+                default_factory=lambda: HandlerResult(f"Read output timed out for PID {pid}", is_error=True)
             )
             
-            if result.get("isError"):
-                return f"Error: {result['content'][0]['text']}"
-            
-            return result["content"][0]["text"]
+            return ("Error: " if result.is_error else "") + result.text
             
         except Exception as e:
             return f"Error reading output: {str(e)}"
@@ -84,23 +65,15 @@ class TerminalTerminatorLogic:
     def terminate(self, pid: int) -> str:
         """Force terminate a running terminal session."""
         try:
-            coro = handle_force_terminate({
-                "pid": pid
-            })
+            coro = handle_force_terminate_kw(pid=pid)
             
             result = run_coroutine_with_timeout(
                 coro,
                 timeout_seconds=10.0,
-                default_result={
-                    "content": [{"type": "text", "text": f"Termination request timed out for PID {pid}"}],
-                    "isError": True
-                }
+                default_factory=lambda: HandlerResult(f"Termination request timed out for PID {pid}", is_error=True)
             )
             
-            if result.get("isError"):
-                return f"Error: {result['content'][0]['text']}"
-            
-            return result["content"][0]["text"]
+            return ("Error: " if result.is_error else "") + result.text
             
         except Exception as e:
             return f"Error terminating session: {str(e)}"
@@ -112,21 +85,15 @@ class TerminalSessionListerLogic:
     def list_sessions(self) -> str:
         """List all active terminal sessions."""
         try:
-            coro = handle_list_sessions({})
+            coro = handle_list_sessions()
             
             result = run_coroutine_with_timeout(
                 coro,
                 timeout_seconds=5.0,
-                default_result={
-                    "content": [{"type": "text", "text": "List sessions timed out"}],
-                    "isError": True
-                }
+                default_factory=lambda: HandlerResult("List sessions timed out", is_error=True)
             )
             
-            if result.get("isError"):
-                return f"Error: {result['content'][0]['text']}"
-            
-            return result["content"][0]["text"]
+            return ("Error: " if result.is_error else "") + result.text
             
         except Exception as e:
             return f"Error listing sessions: {str(e)}"
@@ -143,16 +110,10 @@ class ProcessListerLogic:
             result = run_coroutine_with_timeout(
                 coro,
                 timeout_seconds=10.0,
-                default_result={
-                    "content": [{"type": "text", "text": "List processes timed out"}],
-                    "isError": True
-                }
+                default_factory=lambda: HandlerResult("List processes timed out", is_error=True)
             )
             
-            if result.get("isError"):
-                return f"Error: {result['content'][0]['text']}"
-            
-            return result["content"][0]["text"]
+            return ("Error: " if result.is_error else "") + result.text
             
         except Exception as e:
             return f"Error listing processes: {str(e)}"
@@ -164,23 +125,15 @@ class ProcessKillerLogic:
     def kill(self, pid: int) -> str:
         """Terminate a running process by PID."""
         try:
-            coro = handle_kill_process({
-                "pid": pid
-            })
+            coro = handle_kill_process_kw(pid=pid)
             
             result = run_coroutine_with_timeout(
                 coro,
                 timeout_seconds=10.0,
-                default_result={
-                    "content": [{"type": "text", "text": f"Kill process timed out for PID {pid}"}],
-                    "isError": True
-                }
+                default_factory=lambda: HandlerResult(f"Kill process timed out for PID {pid}", is_error=True)
             )
             
-            if result.get("isError"):
-                return f"Error: {result['content'][0]['text']}"
-            
-            return result["content"][0]["text"]
+            return ("Error: " if result.is_error else "") + result.text
             
         except Exception as e:
             return f"Error killing process: {str(e)}"
@@ -0,0 +1,291 @@
+"""
+Tests for the terminal tools (serena.terminal).
+
+All coroutines are run on the persistent background event loop that the terminal tools use in production
+(see serena.util.async_utils), so the tests share a single event loop; independent handler calls are
+batched via asyncio.gather.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import serena
+from serena.terminal import (
+    CommandManager,
+    TerminalManager,
+    handle_execute_command,
+    handle_force_terminate,
+    handle_kill_process,
+    handle_list_processes,
+    handle_list_sessions,
+    handle_read_output,
+)
+from serena.terminal.terminal_types import OutputBuffer
+from serena.util.async_utils import run_coroutine_synchronously
+
+IS_WINDOWS = sys.platform == "win32"
+# A command which runs for a few seconds and produces output only at the end
+LONG_COMMAND = "ping -n 3 127.0.0.1 > NUL && echo done" if IS_WINDOWS else "sleep 2 && echo done"
+
+
+def run(coro):
+    return run_coroutine_synchronously(coro, timeout_seconds=30)
+
+
+async def gather(*coros):
+    return await asyncio.gather(*coros)
+
+
+class TestCommandManager:
+    def test_valid_command(self):
+        assert CommandManager().validate_command("echo 'Hello World'").is_valid
+
+    def test_blocked_command(self):
+        result = CommandManager().validate_command("sudo rm -rf /")
+        assert not result.is_valid
+        assert "sudo" in result.reason
+
+    def test_empty_command(self):
+        assert not CommandManager().validate_command("   ").is_valid
+
+    @pytest.mark.parametrize(
+        "command",
+        [
+            "s'u'do ls",
+            's"ud"o ls',
+            "'sudo' ls",
+            "su\\do ls",
+            "re\\boot",
+            "ls; sudo reboot",
+            "ls && shutdown -h now",
+            "ls || reboot",
+            "cat file | su",
+            "sleep 1 & halt",
+            "SuDo ls",
+            "ls;SHUTDOWN",
+        ],
+    )
+    def test_blocked_command_variants(self, command):
+        result = CommandManager().validate_command(command)
+        assert not result.is_valid
+        assert result.reason.startswith("Blocked command")
+
+    @pytest.mark.parametrize(
+        "command",
+        [
+            "echo result",
+            "echo 'sudo is blocked'",
+            "git status && git diff",
+            "ls -la | grep format",
+            "cat 'my file.txt'",
+            "echo it\\'s fine",
+        ],
+    )
+    def test_benign_command_variants(self, command):
+        assert CommandManager().validate_command(command).is_valid
+
+    @pytest.mark.parametrize("command", ["echo x > /dev/sda", "ls && rm -rf /", "sudo rm file"])
+    def test_dangerous_patterns(self, command):
+        assert not CommandManager().validate_command(command).is_valid
+
+    def test_custom_blocked_commands(self):
+        manager = CommandManager(["curl"])
+        assert manager.validate_command("sudo ls").is_valid
+        assert not manager.validate_command("ls | c'u'rl example.com").is_valid
+        manager.add_blocked_command("Wget")
+        assert not manager.validate_command("WGET example.com").is_valid
+        manager.remove_blocked_command("curl")
+        assert manager.validate_command("curl example.com").is_valid
+
+
+class TestOutputBuffer:
+    def test_read_new_returns_only_unread_output(self):
+        buffer = OutputBuffer()
+        assert buffer.read_new() == ""
+        buffer.append("abc")
+        buffer.append("")
+        buffer.append("def")
+        assert buffer.read_new() == "abcdef"
+        assert buffer.read_new() == ""
+        buffer.append("gh")
+        assert buffer.read_new() == "gh"
+        assert buffer.getvalue() == "abcdefgh"
+        assert len(buffer) == 8
+
+    def test_getvalue_does_not_consume_unread_output(self):
+        buffer = OutputBuffer()
+        buffer.append("abc")
+        buffer.append("def")
+        assert buffer.getvalue() == "abcdef"
+        buffer.append("g")
+        # The compacted chunk is still read from the right offset
+        assert buffer.read_new() == "abcdefg"
+        assert buffer.getvalue() == "abcdefg"
+
+    def test_unread_output_within_compacted_chunk(self):
+        buffer = OutputBuffer()
+        buffer.append("abc")
+        assert buffer.read_new() == "abc"
+        buffer.append("def")
+        buffer.getvalue()
+        assert buffer.read_new() == "def"
+
+    def test_eviction_keeps_last_max_length_characters(self):
+        buffer = OutputBuffer(max_length=10)
+        for chunk in ["abc", "defg", "hij", "klmno"]:
+            buffer.append(chunk)
+        # Whole chunks are dropped as long as at least max_length characters remain
+        assert len(buffer) == 12
+        assert buffer.getvalue() == "[... 3 characters of earlier output omitted ...]\ndefghijklmno"
+
+    def test_eviction_of_unread_output_is_marked(self):
+        buffer = OutputBuffer(max_length=10)
+        buffer.append("abc")
+        assert buffer.read_new() == "abc"
+        for chunk in ["defg", "hij", "klmno"]:
+            buffer.append(chunk)
+        # "abc" had been read, so no unread output was dropped
+        assert buffer.read_new() == "defghijklmno"
+        buffer.append("pqrstuvwxyz")
+        assert buffer.read_new() == "pqrstuvwxyz"
+        for chunk in ["12345", "67890", "ABCDEF"]:
+            buffer.append(chunk)
+        # Dropping the read chunk "pqrstuvwxyz" is not marked, dropping the unread chunk "12345" is
+        assert buffer.read_new() == "[... 5 characters of earlier output omitted ...]\n67890ABCDEF"
+        assert buffer.read_new() == ""
+
+    def test_oversized_chunk_is_retained(self):
+        buffer = OutputBuffer(max_length=4)
+        buffer.append("ab")
+        buffer.append("cdefgh")
+        assert buffer.read_new() == "[... 2 characters of earlier output omitted ...]\ncdefgh"
+
+
+class TestTerminalManager:
+    def test_quick_command_completes(self):
+        manager = TerminalManager()
+        result = run(manager.execute_command("echo Hello from Serena", timeout_ms=5000))
+        assert result.pid > 0
+        assert not result.is_blocked
+        assert "Hello from Serena" in result.initial_output
+
+    def test_long_command_returns_while_running(self):
+        manager = TerminalManager()
+        result = run(manager.execute_command(LONG_COMMAND, timeout_ms=200))
+        assert result.pid > 0
+        assert result.is_blocked
+        assert [s.pid for s in manager.list_active_sessions()] == [result.pid]
+
+        # Once the process has completed, its final output is available
+        completed_event = manager.get_session(result.pid).completed_event
+        assert completed_event.wait(10)
+        assert "done" in manager.get_new_output(result.pid)
+        assert manager.list_active_sessions() == []
+
+    @pytest.mark.skipif(IS_WINDOWS, reason="uses POSIX shell background jobs")
+    def test_background_child_does_not_block(self):
+        # The background child keeps the output pipe open after the command itself has exited
+        manager = TerminalManager()
+        start = time.monotonic()
+        result = run(manager.execute_command("sleep 3 & echo started", timeout_ms=2000))
+        assert time.monotonic() - start < 1.5
+        assert not result.is_blocked
+        assert "started" in result.initial_output
+
+
+class TestTerminalHandlers:
+    def test_quick_command_returns_output(self):
+        result = run(handle_execute_command({"command": "echo Test quick command", "timeout_ms": 3000}))
+        assert not result.is_error
+        assert "Test quick command" in result.text
+        assert "Command started with PID" not in result.text
+
+    def test_long_command_returns_pid(self):
+        result = run(handle_execute_command({"command": LONG_COMMAND, "timeout_ms": 200}))
+        assert not result.is_error
+        assert result.text.startswith("Command started with PID")
+
+        pid = int(result.text.split()[4])
+        result = run(handle_read_output({"pid": pid, "timeout_ms": 10000}))
+        assert not result.is_error
+        assert "done" in result.text
+
+    def test_invalid_command(self):
+        result = run(handle_execute_command({"command": "nonexistentcommand123", "timeout_ms": 3000}))
+        text = result.text.lower()
+        assert "nonexistentcommand123" in text or "not found" in text or "not recognized" in text
+
+    def test_blocked_command(self):
+        result = run(handle_execute_command({"command": "sudo ls"}))
+        assert result.is_error
+        assert "Blocked command" in result.text
+
+    def test_force_terminate(self):
+        result = run(handle_execute_command({"command": LONG_COMMAND, "timeout_ms": 200}))
+        pid = int(result.text.split()[4])
+        result = run(handle_force_terminate({"pid": pid}))
+        assert not result.is_error
+        assert str(pid) in result.text
+
+    def test_invalid_pid(self):
+        results = run(
+            gather(
+                handle_read_output({"pid": "abc"}),
+                handle_force_terminate({"pid": None}),
+                handle_kill_process({"pid": -1}),
+            )
+        )
+        assert all(result.is_error for result in results)
+
+    def test_independent_handlers(self):
+        exec_res, list_res, proc_res = run(
+            gather(
+                handle_execute_command({"command": "echo Handler Test", "timeout_ms": 2000}),
+                handle_list_sessions(),
+                handle_list_processes(),
+            )
+        )
+        assert not exec_res.is_error
+        assert not list_res.is_error
+        assert not proc_res.is_error
+        assert proc_res.text.startswith("PID: ")
+
+
+_EXIT_SCRIPT = """
+import atexit, threading, time
+from serena.terminal.terminal_handlers import terminal_manager
+from serena.util.terminal_tools import TerminalExecutorLogic, TerminalReaderLogic
+
+# Runs after the interpreter has joined its non-daemon threads
+atexit.register(lambda: [terminal_manager.force_terminate(s.pid) for s in terminal_manager.list_active_sessions()])
+if {read}:
+    pid = int(TerminalExecutorLogic().execute("sleep 20", 100).split()[4])
+    call = lambda: TerminalReaderLogic().read(pid, 15000)
+else:
+    call = lambda: TerminalExecutorLogic().execute("sleep 20", 15000)
+threading.Thread(target=call, daemon=True).start()
+time.sleep(0.5)
+"""
+
+
+@pytest.mark.skipif(IS_WINDOWS, reason="uses POSIX sleep")
+@pytest.mark.parametrize("read", [False, True], ids=["execute", "read"])
+def test_pending_call_does_not_block_interpreter_exit(read):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.dirname(os.path.dirname(serena.__file__)), *sys.path]))
+    start = time.monotonic()
+    subprocess.run([sys.executable, "-c", _EXIT_SCRIPT.format(read=read)], env=env, check=True, timeout=30)
+    assert time.monotonic() - start < 5
+
+
+@pytest.mark.skipif(IS_WINDOWS, reason="uses POSIX signals")
+def test_kill_process():
+    result = run(handle_execute_command({"command": "sleep 10", "timeout_ms": 100}))
+    pid = int(result.text.split()[4])
+    result = run(handle_kill_process({"pid": pid}))
+    assert not result.is_error
+    assert f"process {pid}" in result.text